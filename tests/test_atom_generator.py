@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from wintersun import atom_generator
@@ -72,3 +74,37 @@ class TestFeed:
         assert result_xml.count('blog.com/entry-2') == 2
         assert result_xml.count('New Content!') == 5
         assert result_xml.count('2015-06-13T00:00:00-06:00') == 2
+
+    def test_keeps_newest_entries(self, feed):
+        for day in (13, 15, 11, 14):
+            entry = self.entry.copy()
+            entry['title'] = f'entry-{day}'
+            entry['published'] = f'2015-06-{day}T00:00:00-06:00'
+            feed.add_entry(entry)
+
+        result_xml = feed.generate_xml(mAx=2)
+
+        assert result_xml.count('<entry>') == 2
+        assert result_xml.index('entry-15') < result_xml.index('entry-14')
+        assert 'entry-13' not in result_xml
+
+    def test_escapes_text_and_attributes(self, feed):
+        entry = self.entry.copy()
+        entry['link'] = 'http://blog.com/?a=1&b=2'
+        entry['content'] = '<p class="x">Fish & Chips</p>'
+        feed.add_entry(entry)
+
+        result_xml = feed.generate_xml()
+
+        assert 'href="http://blog.com/?a=1&amp;b=2"' in result_xml
+        assert ('&lt;p class=&quot;x&quot;&gt;Fish &amp; Chips&lt;/p&gt;'
+                in result_xml)
+
+    def test_write_streams_entries_from_iterable(self, feed):
+        entries = (dict(self.entry, title=f'entry-{idx}') for idx in range(3))
+        buf = io.StringIO()
+
+        feed.write(buf, entries)
+
+        assert buf.getvalue().count('<entry>') == 3
+        assert feed.entry_data == []
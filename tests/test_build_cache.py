@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from wintersun import build_cache
+
+
+RENDERER_KEY = {'markdown2': '2.3.5', 'extras': ['metadata']}
+
+
+@pytest.fixture
+def post():
+    return {
+        'title': 'Test Post',
+        'date': '2014-12-31 01:16:13',
+        'template': 'Post',
+        'standardized_name': 'test-post',
+        'tags': ['tag1', 'tag2'],
+        'contents': '<p>Lorem ipsum</p>\n'}
+
+
+@pytest.fixture
+def md_file(tmpdir):
+    md_file = tmpdir.mkdir('posts').join('test-post.md')
+    md_file.write('Title: Test Post\n\nLorem ipsum\n')
+    return md_file
+
+
+def _put(cache, md_file, post):
+    data = md_file.read_binary()
+    cache.put(md_file.strpath,
+              build_cache.fingerprint(os.stat(md_file.strpath), data), post)
+
+
+class TestBuildCache:
+    def test_get_unknown_file_misses(self, tmpdir, md_file):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+
+        assert cache.get(md_file.strpath) is None
+        assert cache.misses == 1
+
+    def test_get_unchanged_file_hits(self, tmpdir, md_file, post):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        _put(cache, md_file, post)
+
+        assert cache.get(md_file.strpath) == post
+        assert cache.hits == 1
+
+    def test_survives_save_and_load(self, tmpdir, md_file, post):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        _put(cache, md_file, post)
+        cache.save()
+
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        assert cache.get(md_file.strpath) == post
+
+    def test_touched_file_hits_by_hash(self, tmpdir, md_file, post):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        _put(cache, md_file, post)
+        stat = os.stat(md_file.strpath)
+        os.utime(md_file.strpath,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        assert cache.get(md_file.strpath) == post
+
+    def test_changed_file_misses(self, tmpdir, md_file, post):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        _put(cache, md_file, post)
+        md_file.write('Title: Test Post\n\nChanged\n')
+
+        assert cache.get(md_file.strpath) is None
+
+    def test_renderer_change_discards_cache(self, tmpdir, md_file, post):
+        cache = build_cache.BuildCache(tmpdir.join('cache'), RENDERER_KEY)
+        _put(cache, md_file, post)
+        cache.save()
+
+        other_key = dict(RENDERER_KEY, markdown2='2.4.0')
+        cache = build_cache.BuildCache(tmpdir.join('cache'), other_key)
+        assert cache.get(md_file.strpath) is None
+
+    def test_prune_drops_deleted_files(self, tmpdir, md_file, post):
+        cache_dir = tmpdir.join('cache')
+        cache = build_cache.BuildCache(cache_dir, RENDERER_KEY)
+        _put(cache, md_file, post)
+        cache.prune(md_file.dirname, [])
+        cache.save()
+
+        assert cache.entries == {}
+        assert cache_dir.join('html').listdir() == []
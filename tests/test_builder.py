@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+
+from wintersun import builder
+
+
+def _md(title, date, template='Post', tags='python', body='Lorem ipsum'):
+    return (f'Title: {title}\n'
+            f'Date: {date}\n'
+            f'Template: {template}\n'
+            f'Tags: {tags}\n'
+            '\n'
+            f'{body}\n')
+
+
+@pytest.fixture
+def site_dir(tmpdir):
+    posts = tmpdir.mkdir('posts')
+    posts.join('first.md').write(_md('First', '2018-01-01 10:00:00'))
+    posts.join('second.md').write(
+        _md('Second', '2018-02-01 10:00:00', tags='python linux'))
+    posts.join('essay.md').write(
+        _md('Essay', '2017-01-01 10:00:00', template='Essay', tags='essay'))
+    tmpdir.mkdir('flat').join('about.md').write(
+        _md('About', '2017-01-01 10:00:00', template='Page', tags='about'))
+    tmpdir.mkdir('static').join('style.css').write('body {}')
+
+    templates = tmpdir.mkdir('templates')
+    for name in ('post', 'essay', 'page'):
+        templates.join(name + '.html').write(
+            '<h1>{{ post.title }}</h1>{{ post.contents }}')
+    templates.join('tag.html').write(
+        '{{ tag }}{% for item in tagged_items %}{{ item.title }}{% endfor %}')
+    templates.join('posts_index.html').write(
+        '{% for year, items in entries.items() %}{{ year }}'
+        '{% for item in items %}{{ item.title }}{% endfor %}{% endfor %}')
+    templates.join('essays_index.html').write(
+        '{% for item in entries %}{{ item.title }}{% endfor %}')
+    return tmpdir
+
+
+@pytest.fixture
+def config(site_dir, monkeypatch):
+    # post_dir is both a source directory and a path in the output
+    monkeypatch.chdir(site_dir)
+    return {
+        'target_dir': 'out',
+        'static_dir': 'static',
+        'post_dir': 'posts',
+        'flat_dir': 'flat',
+        'template_dir': 'templates',
+        'cache_dir': 'cache',
+        'tag_dir': 'tags',
+        'site_url': 'http://example.com',
+        'feed_title': 'Feed',
+        'author': 'Author',
+        'encoding': 'utf-8'}
+
+
+@pytest.fixture
+def site(config):
+    site = builder.SiteBuilder(config)
+    site.prepare()
+    site.build()
+    return site
+
+
+def _target(site, *parts):
+    return Path(site.target_dir, *parts)
+
+
+@pytest.mark.integration
+class TestSiteBuilder:
+    def test_build_writes_site(self, site):
+        assert _target(site, 'posts', 'first.html').exists()
+        assert _target(site, 'about.html').exists()
+        assert _target(site, 'tags', 'linux.html').exists()
+        assert _target(site, 'static', 'style.css').exists()
+        assert _target(site, 'feed').exists()
+        assert _target(site, 'posts.html').read_text() == '2018SecondFirst'
+
+    def test_rebuild_renders_changed_post(self, site, site_dir):
+        md_path = site_dir.join('posts', 'first.md')
+        md_path.write(_md('First', '2018-01-01 10:00:00', body='Changed'))
+
+        site.rebuild({md_path.strpath})
+
+        assert 'Changed' in _target(site, 'posts', 'first.html').read_text()
+        # feed and the page itself; the indexes didn't change
+        assert site.writer.written == 2
+
+    def test_rebuild_removes_deleted_post(self, site, site_dir):
+        md_path = site_dir.join('posts', 'second.md')
+        md_path.remove()
+
+        site.rebuild({md_path.strpath})
+
+        assert not _target(site, 'posts', 'second.html').exists()
+        assert _target(site, 'posts.html').read_text() == '2018First'
+        assert _target(site, 'tags', 'python.html').read_text() == (
+            'pythonFirst')
+
+    def test_rebuild_after_template_change(self, site, site_dir):
+        site_dir.join('templates', 'tag.html').write('<b>{{ tag }}</b>')
+
+        site.rebuild({site_dir.join('templates', 'tag.html').strpath})
+
+        assert _target(site, 'tags', 'linux.html').read_text() == (
+            '<b>linux</b>')
+        assert site.tracker.skipped == 6
+
+    def test_rebuild_copies_static_files(self, site, site_dir):
+        new_file = site_dir.join('static', 'img', 'logo.png')
+        new_file.write('png', ensure=True)
+        site_dir.join('static', 'style.css').remove()
+
+        site.rebuild({new_file.strpath,
+                      site_dir.join('static', 'style.css').strpath})
+
+        assert _target(site, 'static', 'img', 'logo.png').read_text() == 'png'
+        assert not _target(site, 'static', 'style.css').exists()
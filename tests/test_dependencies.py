@@ -0,0 +1,65 @@
+import pytest
+
+from wintersun import dependencies
+
+
+@pytest.fixture
+def renderer(mocker):
+    renderer = mocker.Mock()
+    renderer.template_digest.side_effect = lambda name: name + '-digest'
+    renderer.dependencies.side_effect = lambda name: ['base.html', name]
+    return renderer
+
+
+def _pages(target_dir, title='Title'):
+    return [(target_dir.join('post.html').strpath, 'post.html',
+             {'post': title}),
+            (target_dir.join('tag.html').strpath, 'tag.html', {'tag': 'x'})]
+
+
+def _build(tracker, renderer, pages):
+    stale = list(tracker.stale_pages(renderer, pages))
+    for fpath, _, _ in stale:
+        open(fpath, 'w').close()
+    return [template_name for _, template_name, _ in stale]
+
+
+class TestRenderTracker:
+    def test_first_build_renders_everything(self, tmpdir, renderer):
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+
+        assert _build(tracker, renderer, _pages(tmpdir)) == [
+            'post.html', 'tag.html']
+        assert tracker.outputs[tmpdir.join('post.html').strpath][
+            'templates'] == ['base.html', 'post.html']
+
+    def test_unchanged_pages_are_skipped(self, tmpdir, renderer):
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+        _build(tracker, renderer, _pages(tmpdir))
+        tracker.save()
+
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+        assert _build(tracker, renderer, _pages(tmpdir)) == []
+        assert tracker.skipped == 2
+
+    def test_changed_context_is_rendered(self, tmpdir, renderer):
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+        _build(tracker, renderer, _pages(tmpdir))
+
+        assert _build(tracker, renderer, _pages(tmpdir, 'New')) == [
+            'post.html']
+
+    def test_changed_template_is_rendered(self, tmpdir, renderer):
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+        _build(tracker, renderer, _pages(tmpdir))
+        renderer.template_digest.side_effect = (
+            lambda name: name + ('-new' if name == 'tag.html' else '-digest'))
+
+        assert _build(tracker, renderer, _pages(tmpdir)) == ['tag.html']
+
+    def test_missing_output_is_rendered(self, tmpdir, renderer):
+        tracker = dependencies.RenderTracker(tmpdir.join('cache'))
+        _build(tracker, renderer, _pages(tmpdir))
+        tmpdir.join('tag.html').remove()
+
+        assert _build(tracker, renderer, _pages(tmpdir)) == ['tag.html']
@@ -0,0 +1,38 @@
+import os
+
+from wintersun import output
+
+
+class TestFileWriter:
+    def test_writes_new_file(self, tmpdir):
+        fpath = tmpdir.join('index.html')
+        writer = output.FileWriter()
+
+        assert writer.write(fpath.strpath, 'contents', 'utf-8')
+        assert fpath.read() == 'contents'
+        assert (writer.written, writer.skipped) == (1, 0)
+
+    def test_skips_unchanged_file(self, tmpdir):
+        fpath = tmpdir.join('index.html')
+        fpath.write('contents')
+        os.utime(fpath.strpath, ns=(0, 0))
+        writer = output.FileWriter()
+
+        assert not writer.write(fpath.strpath, 'contents', 'utf-8')
+        assert os.stat(fpath.strpath).st_mtime_ns == 0
+        assert (writer.written, writer.skipped) == (0, 1)
+
+    def test_rewrites_changed_file_of_same_size(self, tmpdir):
+        fpath = tmpdir.join('index.html')
+        fpath.write('contents')
+        writer = output.FileWriter()
+
+        assert writer.write(fpath.strpath, 'CONTENTS', 'utf-8')
+        assert fpath.read() == 'CONTENTS'
+
+    def test_report(self, tmpdir):
+        writer = output.FileWriter()
+        writer.write(tmpdir.join('a.html').strpath, 'a')
+        writer.write(tmpdir.join('a.html').strpath, 'a')
+
+        assert writer.report() == '1 files written, 1 unchanged'
@@ -1,6 +1,6 @@
 import pytest
 
-from wintersun import post_reader
+from wintersun import build_cache, post_reader
 
 
 @pytest.fixture
@@ -55,3 +55,45 @@ class TestMdFileReader:
             post = posts[1]
 
         assert post == dict_contents
+
+    @pytest.mark.integration
+    def test_read_reuses_cached_posts(self, tmpdir, mocker, md_contents,
+                                      dict_contents):
+        posts = tmpdir.mkdir('posts')
+        posts.join('post1_about_@_things.md').write(md_contents)
+        cache = build_cache.BuildCache(
+            tmpdir.join('cache'), post_reader.MdFileReader.cache_key())
+
+        first = post_reader.MdFileReader.read(posts.strpath, cache)
+        markdown = mocker.patch.object(post_reader.markdown2, 'markdown')
+        second = post_reader.MdFileReader.read(posts.strpath, cache)
+
+        assert not markdown.called
+        assert first == second == [dict_contents]
+
+    @pytest.mark.integration
+    def test_parallel_read_matches_serial(self, tmpdir, md_contents):
+        posts = tmpdir.mkdir('posts')
+        for idx in range(8):
+            posts.join(f'post{idx}.md').write(
+                md_contents.replace('Test Post', f'Test Post {idx}'))
+
+        serial = post_reader.MdFileReader.read(posts.strpath)
+        parallel = post_reader.MdFileReader.read(posts.strpath, workers=2)
+
+        assert parallel == serial
+        assert [p['title'] for p in parallel] == [
+            f'Test Post {idx}' for idx in range(8)]
+
+    @pytest.mark.integration
+    def test_parallel_read_raises_like_serial(self, tmpdir, md_contents):
+        posts = tmpdir.mkdir('posts')
+        posts.join('post1.md').write(md_contents)
+        posts.join('post2.md').write(md_contents.replace('Title', 'Name'))
+
+        with pytest.raises(KeyError) as serial_exc:
+            post_reader.MdFileReader.read(posts.strpath)
+        with pytest.raises(KeyError) as parallel_exc:
+            post_reader.MdFileReader.read(posts.strpath, workers=2)
+
+        assert str(parallel_exc.value) == str(serial_exc.value)
@@ -99,3 +99,27 @@ class TestInMemPostRepo:
 
         assert posts[0].title == example_post_dict['title']
         assert essays[0].title == second_post['title']
+
+    def test_all_returns_copy_of_cached_view(self, inmem_repo):
+        posts = inmem_repo.all()
+        posts.clear()
+
+        assert len(inmem_repo.all()) == 1
+
+    def test_insert_invalidates_cached_views(self, inmem_repo,
+                                             example_post_dict):
+        assert len(inmem_repo.all_by_template('Post')) == 1
+        example_post_dict['title'] = 'Second post'
+        example_post_dict['date'] = '2015-01-01 01:16:13'
+        inmem_repo.insert(**example_post_dict)
+
+        titles = [p.title for p in inmem_repo.all_by_template('Post')]
+        assert titles == ['Second post', 'Test Post']
+
+    def test_invalid_date_raises_on_insert(self, example_post_dict):
+        repo = post_repo.InMemPostRepo()
+        example_post_dict['date'] = '2014-12-31'
+        with pytest.raises(ValueError):
+            repo.insert(**example_post_dict)
+
+        assert len(repo) == 0
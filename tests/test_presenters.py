@@ -2,7 +2,8 @@ from pathlib import Path
 
 import pytest
 
-from wintersun import exceptions, post_item, presenters
+from wintersun import (exceptions, output, post_item, presenters,
+                       renderers)
 
 
 @pytest.fixture
@@ -31,6 +32,28 @@ def mock_renderer(mocker):
     return renderer
 
 
+@pytest.fixture
+def template_renderer(tmpdir):
+    template_dir = tmpdir.mkdir('templates')
+    template_dir.join('post.html').write(
+        '<h1>{{ post.title }}</h1>{{ post.contents }}')
+    template_dir.join('tag.html').write(
+        '<h1>{{ tag }}</h1>'
+        '{% for item in tagged_items %}{{ item.title }}{% endfor %}')
+    return renderers.TemplateRenderer(template_dir.strpath)
+
+
+@pytest.fixture
+def many_posts(post):
+    return [post._replace(title=f'Post {idx}', standardized_name=f'post-{idx}',
+                          tags=['programming', f'tag{idx % 3}'])
+            for idx in range(12)]
+
+
+def _read_files(target_dir):
+    return {f.name: f.read_bytes() for f in target_dir.iterdir()}
+
+
 class TestAtomPresenter:
     def test_writes_to_path(self, tmpdir, atom_presenter_kwargs):
         target_dir = tmpdir.mkdir('target')
@@ -105,6 +128,35 @@ class TestAtomPresenter:
             assert f.read() == expected_output
 
 
+    def test_full_content_entries(self, tmpdir, atom_presenter_kwargs, post):
+        target_fpath = Path(tmpdir.strpath, 'test_feed')
+        post = post._replace(contents='<p>' + 'Lorem ipsum ' * 20 + '</p>')
+
+        presenter = presenters.AtomPresenter(
+            full_content=True, **atom_presenter_kwargs)
+        presenter.output([post], target_fpath)
+
+        with open(target_fpath, 'r') as f:
+            assert ('&lt;p&gt;' + 'Lorem ipsum ' * 20 + '&lt;/p&gt;'
+                    in f.read())
+
+    def test_unchanged_feed_is_not_rewritten(self, tmpdir, mocker,
+                                             atom_presenter_kwargs, post):
+        target_fpath = Path(tmpdir.strpath, 'test_feed')
+        writer = output.FileWriter()
+        presenter = presenters.AtomPresenter(writer=writer,
+                                             **atom_presenter_kwargs)
+        mocker.patch.object(presenter, '_rfc3339_ts_now',
+                            return_value='2018-01-01T13:03:16-05:00')
+
+        presenter.output([post], target_fpath)
+        presenter.output([post], target_fpath)
+
+        assert (writer.written, writer.skipped) == (1, 1)
+        assert [p.name for p in Path(tmpdir.strpath).iterdir()] == [
+            'test_feed']
+
+
 class TestHTMLPresenter:
     def test_outputs_post_files(self, tmpdir, post, mock_renderer):
         container_dir = tmpdir.mkdir('test')
@@ -146,6 +198,35 @@ class TestHTMLPresenter:
                 assert posts[idx].title in f.read()
 
 
+    def test_skips_unchanged_posts(self, tmpdir, post, mock_renderer):
+        target_dir = Path(tmpdir.strpath, 'posts')
+        post2 = post._replace(
+            title='Second post', standardized_name='second-post')
+        presenters.HTMLPresenter(mock_renderer).output([post, post2],
+                                                       target_dir)
+
+        writer = output.FileWriter()
+        presenter = presenters.HTMLPresenter(mock_renderer, writer=writer)
+        presenter.output([post, post2._replace(contents='Changed')],
+                         target_dir)
+
+        assert (writer.written, writer.skipped) == (1, 1)
+
+    @pytest.mark.integration
+    def test_parallel_output_matches_serial(self, tmpdir, template_renderer,
+                                            many_posts):
+        serial_dir = Path(tmpdir.strpath, 'serial')
+        parallel_dir = Path(tmpdir.strpath, 'parallel')
+
+        presenters.HTMLPresenter(template_renderer).output(
+            many_posts, serial_dir)
+        presenters.HTMLPresenter(template_renderer, workers=3).output(
+            many_posts, parallel_dir)
+
+        assert len(_read_files(serial_dir)) == len(many_posts)
+        assert _read_files(parallel_dir) == _read_files(serial_dir)
+
+
 class TestTagPresenter:
     def test_generate_one_index_with_posts(self, tmpdir, mock_renderer, post):
         container_dir = tmpdir.mkdir('test')
@@ -214,6 +295,23 @@ class TestTagPresenter:
             presenter.output([post2], target_dir)
 
 
+    @pytest.mark.integration
+    def test_parallel_output_matches_serial(self, tmpdir, template_renderer,
+                                            many_posts):
+        serial_dir = Path(tmpdir.strpath, 'serial')
+        parallel_dir = Path(tmpdir.strpath, 'parallel')
+
+        presenters.TagPresenter(
+            template_renderer, 'example.com', 'posts').output(
+                many_posts, serial_dir)
+        presenters.TagPresenter(
+            template_renderer, 'example.com', 'posts', workers=2).output(
+                many_posts, parallel_dir)
+
+        assert len(_read_files(serial_dir)) == 4
+        assert _read_files(parallel_dir) == _read_files(serial_dir)
+
+
 class TestHTMLIndexPresenter:
     def test_generate_empty_index_for_no_posts(self, tmpdir, mock_renderer):
         container_dir = tmpdir.mkdir('test')
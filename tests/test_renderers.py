@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from wintersun import renderers
@@ -37,3 +39,112 @@ class TestTemplateRenderer:
 
         assert res == (f'<h1>{parts["title"]}</h1><h2>{parts["date"]}</h2>'
                        f'{parts["contents"]}')
+
+    def test_unpickled_renderers_are_shared(self, renderer):
+        first = pickle.loads(pickle.dumps(renderer))
+        second = pickle.loads(pickle.dumps(renderer))
+
+        assert first is second
+        assert first.template_dir == renderer.template_dir
+
+    @pytest.mark.integration
+    def test_render_batch_keeps_order(self, renderer):
+        pages = [('post.html', {'title': f'Post {idx}'}) for idx in range(3)]
+
+        res = renderers.render_batch((renderer, pages))
+
+        assert [page.split('</h1>')[0] for page in res] == [
+            '<h1>Post 0', '<h1>Post 1', '<h1>Post 2']
+
+    @pytest.mark.integration
+    def test_bytecode_cache_is_written(self, template_dir, tmpdir):
+        bytecode_dir = tmpdir.join('bytecode')
+        renderer = renderers.TemplateRenderer(template_dir.strpath,
+                                              bytecode_dir.strpath)
+        renderer.render('post.html', title='Title')
+
+        assert len(bytecode_dir.listdir()) == 1
+
+    @pytest.mark.integration
+    def test_bytecode_cache_picks_up_template_changes(self, template_dir,
+                                                      tmpdir):
+        bytecode_dir = tmpdir.join('bytecode').strpath
+        renderers.TemplateRenderer(
+            template_dir.strpath, bytecode_dir).render('post.html')
+        template_dir.join('post.html').write('<p>{{ title }}</p>')
+
+        renderer = renderers.TemplateRenderer(template_dir.strpath,
+                                              bytecode_dir)
+
+        assert renderer.render('post.html', title='New') == '<p>New</p>'
+
+
+class TestPrecompile:
+    @pytest.mark.integration
+    def test_precompiled_renderer_matches_source(self, template_dir, tmpdir,
+                                                 renderer):
+        archive = tmpdir.join('templates.zip').strpath
+        assert renderers.precompile(template_dir.strpath, archive)
+
+        precompiled = renderers.TemplateRenderer(
+            template_dir.strpath, precompiled=archive)
+        parts = {'title': 'Post title', 'date': '2018-01-06',
+                 'contents': 'Lorem ipsum'}
+
+        assert (precompiled.render('post.html', **parts) ==
+                renderer.render('post.html', **parts))
+
+    @pytest.mark.integration
+    def test_precompile_skips_fresh_archive(self, template_dir, tmpdir):
+        archive = tmpdir.join('templates.zip')
+        renderers.precompile(template_dir.strpath, archive.strpath)
+
+        assert not renderers.precompile(template_dir.strpath, archive.strpath)
+
+        archive.setmtime(template_dir.join('post.html').mtime() - 10)
+        assert renderers.precompile(template_dir.strpath, archive.strpath)
+
+
+@pytest.fixture
+def layered_template_dir(tmpdir):
+    template_dir = tmpdir.mkdir('layered')
+    template_dir.join('base.html').write(
+        '{% include "header.html" %}{% block body %}{% endblock %}')
+    template_dir.join('header.html').write('<header></header>')
+    template_dir.join('macros.html').write(
+        '{% macro title(t) %}<h1>{{ t }}</h1>{% endmacro %}')
+    template_dir.join('post.html').write(
+        '{% extends "base.html" %}{% import "macros.html" as m %}'
+        '{% block body %}{{ m.title(post) }}{% endblock %}')
+    template_dir.join('tag.html').write('{{ tag }}')
+    template_dir.join('dynamic.html').write('{% include name %}')
+    return template_dir
+
+
+class TestTemplateDependencies:
+    @pytest.mark.integration
+    def test_follows_extends_include_and_import(self, layered_template_dir):
+        renderer = renderers.TemplateRenderer(layered_template_dir.strpath)
+
+        assert renderer.dependencies('post.html') == [
+            'base.html', 'header.html', 'macros.html', 'post.html']
+        assert renderer.dependencies('tag.html') == ['tag.html']
+
+    @pytest.mark.integration
+    def test_dynamic_reference_depends_on_everything(self,
+                                                     layered_template_dir):
+        renderer = renderers.TemplateRenderer(layered_template_dir.strpath)
+
+        assert len(renderer.dependencies('dynamic.html')) == 6
+
+    @pytest.mark.integration
+    def test_digest_changes_with_included_template(self,
+                                                   layered_template_dir):
+        renderer = renderers.TemplateRenderer(layered_template_dir.strpath)
+        post_digest = renderer.template_digest('post.html')
+        tag_digest = renderer.template_digest('tag.html')
+        layered_template_dir.join('header.html').write('<header>!</header>')
+
+        renderer = renderers.TemplateRenderer(layered_template_dir.strpath)
+        assert renderer.template_digest('post.html') != post_digest
+        assert renderer.template_digest('tag.html') == tag_digest
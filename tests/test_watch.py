@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from wintersun import watch
+
+
+def _change_later(func, delay=0.1):
+    def _run():
+        time.sleep(delay)
+        func()
+    thread = threading.Thread(target=_run)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def watched(tmpdir):
+    watched = tmpdir.mkdir('watched')
+    watched.join('post.md').write('old')
+    return watched
+
+
+class TestPollingWatcher:
+    def test_detects_modified_and_deleted_files(self, watched):
+        watcher = watch.PollingWatcher([watched.strpath], interval=0.01)
+        watched.join('post.md').write('new contents')
+        watched.join('new.md').write('new')
+
+        assert watcher.wait() == {watched.join('post.md').strpath,
+                                  watched.join('new.md').strpath}
+
+        watched.join('new.md').remove()
+        assert watcher.wait() == {watched.join('new.md').strpath}
+
+
+@pytest.mark.skipif(not watch.InotifyWatcher.available(),
+                    reason='inotify not available')
+class TestInotifyWatcher:
+    def test_detects_modified_file(self, watched):
+        watcher = watch.InotifyWatcher([watched.strpath])
+        thread = _change_later(lambda: watched.join('post.md').write('new'))
+
+        assert watcher.wait() == {watched.join('post.md').strpath}
+        thread.join()
+        watcher.close()
+
+    def test_detects_files_in_new_directories(self, watched):
+        watcher = watch.InotifyWatcher([watched.strpath])
+        new_file = watched.join('sub', 'post.md')
+
+        def _create():
+            watched.mkdir('sub')
+            time.sleep(0.1)
+            new_file.write('new')
+        thread = _change_later(_create)
+
+        assert watcher.wait() == {new_file.strpath}
+        thread.join()
+        watcher.close()
@@ -1,13 +1,26 @@
-from xml.dom.minidom import Document
+import heapq
+import io
+
+
+def _escape(data, chunk_size=64 * 1024):
+    """Escape text the way minidom does, yielding it in bounded chunks."""
+    for idx in range(0, len(data), chunk_size):
+        yield (data[idx:idx + chunk_size]
+               .replace('&', '&amp;').replace('<', '&lt;')
+               .replace('"', '&quot;').replace('>', '&gt;'))
 
 
 class Feed:
+    """Atom feed written straight to a file object.
+
+    The output matches what `xml.dom.minidom`'s `toprettyxml(indent='    ')`
+    used to produce, without building a DOM or the whole document in memory.
+    """
+    INDENT = '    '
+
     def __init__(self, feed_title, site_url, ts):
-        self.doc = None
-        self.feed = None
         self.entry_data = []
         self.settings = self._build_settings_list(feed_title, site_url, ts)
-        self.create_feed()
 
     def _build_settings_list(self, title, url, timestamp):
         return [
@@ -26,80 +39,64 @@ class Feed:
             {'name': 'updated',
                 'value': timestamp}]
 
-    def create_header_nodes(self, doc):
-        for setting in self.settings:
-            el = doc.createElement(setting['name'])
-
-            if 'value' in setting:
-                el.appendChild(doc.createTextNode(setting['value']))
-
-            if 'attributes' in setting:
-                for k, v in setting['attributes'].items():
-                    el.setAttribute(k, v)
-
-            yield el
-
-    def create_feed(self):
-        """Creates Atom root element; Creates feed element"""
-        doc = Document()
-        feed = doc.createElement('feed')
-        feed.setAttribute('xmlns', 'http://www.w3.org/2005/Atom')
-        doc.appendChild(feed)
-
-        for setting_node in self.create_header_nodes(doc):
-            feed.appendChild(setting_node)
-
-        self.doc = doc
-        self.feed = feed
-
     def add_entry(self, entry):
         self.entry_data.append(entry)
 
-    def generate_entry(self, entry_dict):
-        # make into map + loop
-        entry = self.doc.createElement('entry')
-
-        title = self.doc.createElement('title')
-        title.appendChild(self.doc.createTextNode(entry_dict['title']))
-
-        link = self.doc.createElement('link')
-        link.setAttribute('rel', 'alternate')
-        link.setAttribute('type', 'text/html')
-        link.setAttribute('href', entry_dict['link'])
-
-        entry_id = self.doc.createElement('id')
-        entry_id.appendChild(self.doc.createTextNode(entry_dict['link']))
-
-        published = self.doc.createElement('published')
-        published.appendChild(self.doc.createTextNode(entry_dict['published']))
-
-        updated = self.doc.createElement('updated')
-        updated.appendChild(self.doc.createTextNode(entry_dict['updated']))
-
-        name = self.doc.createElement('name')
-        name.appendChild(self.doc.createTextNode(entry_dict['name']))
-
-        author = self.doc.createElement('author')
-        author.appendChild(name)
-
-        content = self.doc.createElement('content')
-        content.setAttribute('type', 'html')
-        content.appendChild(self.doc.createTextNode(entry_dict['content']))
-
-        entry.appendChild(title)
-        entry.appendChild(link)
-        entry.appendChild(entry_id)
-        entry.appendChild(published)
-        entry.appendChild(updated)
-        entry.appendChild(author)
-        entry.appendChild(content)
-
-        self.feed.appendChild(entry)
+    def _write_element(self, f, depth, name, value=None, attributes=None):
+        f.write(self.INDENT * depth + '<' + name)
+        for k, v in sorted((attributes or {}).items()):
+            f.write(f' {k}="')
+            f.writelines(_escape(v))
+            f.write('"')
+
+        if value is None:
+            f.write('/>\n')
+            return
+        f.write('>')
+        f.writelines(_escape(value))
+        f.write(f'</{name}>\n')
+
+    def write_entry(self, f, entry_dict):
+        f.write(self.INDENT + '<entry>\n')
+        self._write_element(f, 2, 'title', entry_dict['title'])
+        self._write_element(
+            f, 2, 'link', attributes={
+                'rel': 'alternate',
+                'type': 'text/html',
+                'href': entry_dict['link']})
+        self._write_element(f, 2, 'id', entry_dict['link'])
+        self._write_element(f, 2, 'published', entry_dict['published'])
+        self._write_element(f, 2, 'updated', entry_dict['updated'])
+        f.write(self.INDENT * 2 + '<author>\n')
+        self._write_element(f, 3, 'name', entry_dict['name'])
+        f.write(self.INDENT * 2 + '</author>\n')
+        self._write_element(
+            f, 2, 'content', entry_dict['content'], {'type': 'html'})
+        f.write(self.INDENT + '</entry>\n')
+
+    def write(self, f, entries=None, mAx=10):
+        """Write the feed with the `mAx` most recently published entries.
+
+        :param f: Text file object.
+        :param entries: Iterable of entry dicts, consumed once. Defaults to
+                        the entries added with `add_entry`.
+        """
+        entries = self.entry_data if entries is None else entries
+        # same result as a stable reverse sort, without sorting everything
+        newest = heapq.nlargest(
+            mAx, entries, key=lambda entry: entry['published'])
+
+        f.write('<?xml version="1.0" ?>\n')
+        f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        for setting in self.settings:
+            self._write_element(
+                f, 1, setting['name'], setting.get('value'),
+                setting.get('attributes'))
+        for entry in newest:
+            self.write_entry(f, entry)
+        f.write('</feed>\n')
 
     def generate_xml(self, mAx=10):
-        self.entry_data.sort(
-            key=lambda entry: entry['published'], reverse=True)
-        for entry in self.entry_data[:mAx]:
-            self.generate_entry(entry)
-
-        return self.doc.toprettyxml(indent='    ')
+        buf = io.StringIO()
+        self.write(buf, mAx=mAx)
+        return buf.getvalue()
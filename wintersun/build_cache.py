@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def fingerprint(stat, data):
+    """Describe a source file: size, mtime and content hash.
+
+    :param stat: os.stat_result of the file, taken before reading it.
+    :param data: Raw bytes of the file.
+    """
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(data).hexdigest()}
+
+
+class BuildCache:
+    """On-disk manifest of parsed markdown files.
+
+    Metadata for every source file is kept in a JSON manifest, rendered
+    HTML bodies are stored separately and addressed by the source hash.
+    The whole cache is discarded when the markdown renderer settings
+    (eg. markdown2 version or extras) differ from the ones it was built with.
+    """
+    MANIFEST = 'manifest.json'
+    HTML_DIR = 'html'
+    FORMAT = 1
+
+    def __init__(self, cache_dir, renderer_key):
+        self.cache_dir = Path(cache_dir)
+        self.html_dir = self.cache_dir / self.HTML_DIR
+        self.renderer_key = renderer_key
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        try:
+            with open(self.cache_dir / self.MANIFEST, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (manifest.get('format') != self.FORMAT or
+                manifest.get('renderer') != self.renderer_key):
+            return {}
+        return manifest.get('entries', {})
+
+    def _key(self, md_file_path):
+        return os.path.abspath(md_file_path)
+
+    def _html_path(self, digest):
+        return self.html_dir / (digest + '.html')
+
+    def get(self, md_file_path):
+        """Return the cached post dict for an unchanged file, else None.
+
+        Size and mtime are checked first; the content hash is only computed
+        when those differ but the file might still be the same (eg. touched).
+        """
+        key = self._key(md_file_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stat = os.stat(md_file_path)
+        if (stat.st_size != entry['size'] or
+                stat.st_mtime_ns != entry['mtime_ns']):
+            with open(md_file_path, 'rb') as f:
+                data = f.read()
+            source = fingerprint(stat, data)
+            if source['sha256'] != entry['sha256']:
+                self.misses += 1
+                return None
+            entry.update(source)
+
+        try:
+            with open(self._html_path(entry['sha256']), 'r',
+                      encoding='utf-8') as f:
+                contents = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        post = dict(entry['post'])
+        post['contents'] = contents
+        return post
+
+    def put(self, md_file_path, source, post):
+        """Store a freshly parsed post.
+
+        :param md_file_path: Path of the parsed file.
+        :param source: Fingerprint of the parsed file, see `fingerprint`.
+        :param post: Post dict as returned by MdFileReader.
+        """
+        self.html_dir.mkdir(mode=0o755, parents=True, exist_ok=True)
+        with open(self._html_path(source['sha256']), 'w',
+                  encoding='utf-8') as f:
+            f.write(post['contents'])
+
+        metadata = {k: v for k, v in post.items() if k != 'contents'}
+        entry = dict(source)
+        entry['post'] = metadata
+        self.entries[self._key(md_file_path)] = entry
+
+    def prune(self, root, md_file_paths):
+        """Forget files under `root` that weren't seen in the last read."""
+        prefix = os.path.join(os.path.abspath(root), '')
+        seen = {self._key(p) for p in md_file_paths}
+        for key in list(self.entries):
+            if key.startswith(prefix) and key not in seen:
+                del self.entries[key]
+
+    def save(self):
+        """Write the manifest and drop HTML bodies nothing refers to."""
+        self.cache_dir.mkdir(mode=0o755, parents=True, exist_ok=True)
+        manifest = {
+            'format': self.FORMAT,
+            'renderer': self.renderer_key,
+            'entries': self.entries}
+        tmp_path = self.cache_dir / (self.MANIFEST + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.cache_dir / self.MANIFEST)
+
+        if self.html_dir.exists():
+            referenced = {e['sha256'] + '.html' for e in self.entries.values()}
+            for html_file in self.html_dir.iterdir():
+                if html_file.name not in referenced:
+                    html_file.unlink()
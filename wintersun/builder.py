@@ -0,0 +1,212 @@
+import configparser
+import os
+import shutil
+from pathlib import Path
+
+from wintersun import (build_cache, dependencies, output, post_reader,
+                       post_repo, presenters, renderers)
+
+
+def getboolean(config, key, default=False):
+    value = config.get(key)
+    if value is None:
+        return default
+    return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+
+
+def _is_within(path, directory):
+    directory = os.path.abspath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+class SiteBuilder:
+    """Builds a site described by a manifest config.
+
+    The repositories, renderer and caches stay in memory after `build`, so
+    `rebuild` can update the site after a few source files changed without
+    reading or rendering everything again.
+    """
+    def __init__(self, config, workers=1):
+        self.config = config
+        self.workers = workers
+        self.target_dir = Path(config['target_dir'])
+        self.static_dir = Path(config['static_dir'])
+        self.reader = post_reader.MdFileReader
+        self.writer = output.FileWriter()
+
+        self.cache = None
+        self.tracker = None
+        if config.get('cache_dir'):
+            self.cache = build_cache.BuildCache(
+                config['cache_dir'], self.reader.cache_key())
+            self.tracker = dependencies.RenderTracker(config['cache_dir'])
+
+        self.renderer = self._get_renderer()
+        self.repo = post_repo.InMemPostRepo()
+        self.flat_repo = post_repo.InMemPostRepo()
+
+    def _get_renderer(self):
+        bytecode_dir = None
+        if self.config.get('cache_dir'):
+            bytecode_dir = Path(self.config['cache_dir']) / 'jinja'
+
+        precompiled = self.config.get('precompiled_templates')
+        if precompiled:
+            renderers.precompile(self.config['template_dir'], precompiled)
+        return renderers.TemplateRenderer(
+            self.config['template_dir'], bytecode_dir, precompiled or None)
+
+    def prepare(self, delete_target_dir=False):
+        if delete_target_dir and self.target_dir.exists():
+            shutil.rmtree(self.target_dir)
+
+        if not self.target_dir.exists():
+            self.target_dir.mkdir(mode=0o755)
+
+        shutil.copytree(self.static_dir, self.target_dir / 'static')
+
+    def watched_dirs(self):
+        return [self.config['post_dir'], self.config['flat_dir'],
+                self.config['template_dir'], self.config['static_dir']]
+
+    def _reset_counters(self):
+        self.writer = output.FileWriter()
+        if self.tracker is not None:
+            self.tracker.skipped = 0
+
+    def build(self):
+        """Read all sources and write the whole site."""
+        self._reset_counters()
+        self.repo = post_repo.InMemPostRepo()
+        for post in self.reader.read(self.config['post_dir'], self.cache,
+                                     self.workers):
+            self.repo.insert(**post)
+
+        self.flat_repo = post_repo.InMemPostRepo()
+        for flat_post in self.reader.read(self.config['flat_dir'], self.cache,
+                                          self.workers):
+            self.flat_repo.insert(**flat_post)
+
+        self._output_indexes()
+        self._output_posts(self.repo.all())
+        self._output_flat_posts(self.flat_repo.all())
+        self._save()
+
+    def rebuild(self, changed_paths):
+        """Update the site after `changed_paths` were created, modified or
+        deleted.
+
+        Only the pages of changed posts are rendered; tag pages, indexes and
+        the feed are regenerated from the in-memory repositories. A template
+        change re-renders the pages depending on it.
+        """
+        self._reset_counters()
+        changed = {'posts': [], 'flat': [], 'templates': [], 'static': []}
+        dirs = zip(('posts', 'flat', 'templates', 'static'),
+                   self.watched_dirs())
+        for kind, directory in dirs:
+            changed[kind] = [p for p in map(os.path.abspath, changed_paths)
+                             if _is_within(p, directory)]
+
+        if changed['static']:
+            self._update_static(changed['static'])
+
+        updated_posts = self._update_repo(
+            self.repo, changed['posts'],
+            self.target_dir / self.config['post_dir'])
+        updated_flat_posts = self._update_repo(
+            self.flat_repo, changed['flat'], self.target_dir)
+
+        if changed['templates']:
+            self.renderer = self._get_renderer()
+            self._output_indexes()
+            self._output_posts(self.repo.all())
+            self._output_flat_posts(self.flat_repo.all())
+        else:
+            if updated_posts is not None:
+                self._output_indexes()
+                self._output_posts(updated_posts)
+            if updated_flat_posts:
+                self._output_flat_posts(updated_flat_posts)
+        self._save()
+
+    def _update_repo(self, repo, md_paths, target_dir):
+        """Apply changed markdown files to `repo`.
+
+        :returns: Posts that need their page rendered, or None if nothing
+                  in `repo` changed.
+        """
+        md_paths = [p for p in md_paths if p.endswith('.md')]
+        if not md_paths:
+            return None
+
+        updated = []
+        for md_path in md_paths:
+            name = self.reader.standardized_name(md_path)
+            for post in list(repo.posts):
+                if post.standardized_name == name:
+                    repo.remove(post.title)
+
+            if os.path.exists(md_path):
+                post = self.reader.read_file(md_path, self.cache)
+                repo.insert(**post)
+                updated.append(repo.get(post['title']))
+            else:
+                try:
+                    (target_dir / (name + '.html')).unlink()
+                except FileNotFoundError:
+                    pass
+        return updated
+
+    def _update_static(self, paths):
+        for path in paths:
+            target = self.target_dir / 'static' / os.path.relpath(
+                path, self.static_dir)
+            if os.path.isfile(path):
+                target.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+                shutil.copy2(path, target)
+            elif not os.path.exists(path) and target.is_file():
+                target.unlink()
+
+    def _output_indexes(self):
+        config = self.config
+        atom_feed = presenters.AtomPresenter(
+            config['feed_title'], config['site_url'], config['post_dir'],
+            config['author'], config['encoding'], self.writer,
+            getboolean(config, 'feed_full_content'))
+        atom_feed.output(self.repo.all(), self.target_dir / 'feed')
+
+        tags = presenters.TagPresenter(
+            self.renderer, config['site_url'], config['post_dir'],
+            self.workers, self.writer, self.tracker)
+        tags.output(self.repo.all(), self.target_dir / config['tag_dir'])
+
+        indexes = presenters.HTMLIndexPresenter(
+            self.renderer, config['site_url'], config['post_dir'],
+            self.writer, self.tracker)
+        indexes.output(self.repo.all_by_template('Post'), 'post',
+                       self.target_dir)
+        indexes.output(self.repo.all_by_template('Essay'), 'essay',
+                       self.target_dir, grouped=False)
+
+    def _output_posts(self, posts):
+        presenter = presenters.HTMLPresenter(
+            self.renderer, self.workers, self.writer, self.tracker)
+        presenter.output(posts, self.target_dir / self.config['post_dir'])
+
+    def _output_flat_posts(self, flat_posts):
+        presenter = presenters.HTMLPresenter(
+            self.renderer, self.workers, self.writer, self.tracker)
+        presenter.output(flat_posts, self.target_dir)
+
+    def _save(self):
+        if self.cache is not None:
+            self.cache.save()
+            self.tracker.save()
+
+    def report(self):
+        lines = []
+        if self.tracker is not None:
+            lines.append(self.tracker.report())
+        lines.append(self.writer.report())
+        return '\n'.join(lines)
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+class RenderTracker:
+    """Remembers which templates and inputs every output file was built from.
+
+    A page is only rendered again when one of its templates (followed through
+    extends/include/import) or its template context changed, or when the
+    output file is gone.
+    """
+    MANIFEST = 'renders.json'
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.outputs = self._load()
+        self.skipped = 0
+
+    def _load(self):
+        try:
+            with open(self.cache_dir / self.MANIFEST, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _page_key(self, renderer, template_name, context):
+        digest = hashlib.sha256(
+            renderer.template_digest(template_name).encode('utf-8'))
+        for name, value in sorted(context.items()):
+            digest.update(f'{name}={value!r}\0'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def stale_pages(self, renderer, pages):
+        """Filter out pages whose output is up to date.
+
+        :param pages: Iterable of (file_path, template_name, context) tuples.
+        :returns: Generator of the pages that need rendering. They are
+                  recorded as built; call `save` once they are written.
+        """
+        for page in pages:
+            fpath, template_name, context = page
+            key = self._page_key(renderer, template_name, context)
+            output_key = os.path.abspath(fpath)
+            previous = self.outputs.get(output_key)
+            if (previous is not None and previous['key'] == key and
+                    os.path.exists(fpath)):
+                self.skipped += 1
+                continue
+
+            self.outputs[output_key] = {
+                'templates': renderer.dependencies(template_name),
+                'key': key}
+            yield page
+
+    def save(self):
+        self.cache_dir.mkdir(mode=0o755, parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / (self.MANIFEST + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.outputs, f)
+        os.replace(tmp_path, self.cache_dir / self.MANIFEST)
+
+    def report(self):
+        return f'{self.skipped} pages up to date'
@@ -1,19 +1,7 @@
 import argparse
 import configparser
-from pathlib import Path
-from shutil import copytree, rmtree
 
-from wintersun import post_reader, post_repo, presenters, renderers
-
-
-def _prepare_target_dir(target_dir, static_dir, delete_target_dir=False):
-    if delete_target_dir and target_dir.exists():
-        rmtree(target_dir)
-
-    if not target_dir.exists():
-        target_dir.mkdir(mode=0o755)
-
-    copytree(static_dir, target_dir / 'static')
+from wintersun import builder, watch
 
 
 def _get_config(path):
@@ -33,42 +21,29 @@ def main():
         help=("Remove target output directory before "
               "generating. Default: {}").format(False),
         action='store_true')
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=None,
+        help=("Number of worker processes. Overrides 'workers' "
+              "from the manifest. Default: 1"))
+    parser.add_argument(
+        '-w',
+        '--watch',
+        default=False,
+        help=("Keep running and rebuild the site when posts, templates or "
+              "static files change. Default: {}").format(False),
+        action='store_true')
 
     args = parser.parse_args()
     config = _get_config(args.manifest)
+    workers = args.jobs or int(config.get('workers', 1))
 
-    target_dir = Path(config['target_dir'])
-    static_dir = Path(config['static_dir'])
-    _prepare_target_dir(target_dir, static_dir,
-                        config['delete_target_dir'])
-
-    repo = post_repo.InMemPostRepo()
-    for post in post_reader.MdFileReader.read(config['post_dir']):
-        repo.insert(**post)
-
-    atom_feed = presenters.AtomPresenter(
-        config['feed_title'], config['site_url'], config['post_dir'],
-        config['author'], config['encoding'])
-    atom_feed.output(repo.all(), target_dir / 'feed')
-
-    renderer = renderers.TemplateRenderer(config['template_dir'])
-    tags = presenters.TagPresenter(renderer, config['site_url'],
-                                   config['post_dir'])
-    tags.output(repo.all(), target_dir / config['tag_dir'])
-
-    posts = presenters.HTMLPresenter(renderer)
-
-    posts.output(repo.all(), target_dir / config['post_dir'])
-
-    indexes = presenters.HTMLIndexPresenter(renderer, config['site_url'],
-                                            config['post_dir'])
-    indexes.output(repo.all_by_template('Post'), 'post', target_dir)
-    indexes.output(
-        repo.all_by_template('Essay'), 'essay', target_dir, grouped=False)
-
-    flat_repo = post_repo.InMemPostRepo()
-    for flat_post in post_reader.MdFileReader.read(config['flat_dir']):
-        flat_repo.insert(**flat_post)
+    site = builder.SiteBuilder(config, workers)
+    site.prepare(config['delete_target_dir'])
+    site.build()
+    print(site.report())
 
-    flat_posts = presenters.HTMLPresenter(renderer)
-    flat_posts.output(flat_repo.all(), target_dir)
+    if args.watch:
+        watch.watch(site)
@@ -0,0 +1,67 @@
+import filecmp
+import locale
+import os
+from contextlib import contextmanager
+
+
+class FileWriter:
+    """Writes output files, leaving files whose contents didn't change alone.
+
+    Untouched files keep their mtime, so rsync, CDN purges and incremental
+    uploads only see what actually changed.
+    """
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    def write(self, fpath, text, encoding=None):
+        """
+        :param fpath: Target file path.
+        :param text: Contents of the file.
+        :param encoding: Defaults to the same encoding `open` would use.
+        :returns: True if the file was written, False if it was up to date.
+        """
+        data = text.encode(encoding or locale.getpreferredencoding(False))
+        if self._unchanged(fpath, data):
+            self.skipped += 1
+            return False
+
+        with open(fpath, 'wb') as f:
+            f.write(data)
+        self.written += 1
+        return True
+
+    @contextmanager
+    def open(self, fpath, encoding=None):
+        """Stream a file to disk; it's only replaced if its contents changed.
+
+        Yields a text file object writing to a temporary file next to `fpath`.
+        """
+        fpath = str(fpath)
+        tmp_fpath = os.path.join(
+            os.path.dirname(fpath), '.' + os.path.basename(fpath) + '.tmp')
+        try:
+            with open(tmp_fpath, 'w', encoding=encoding) as f:
+                yield f
+            if (os.path.exists(fpath) and
+                    filecmp.cmp(tmp_fpath, fpath, shallow=False)):
+                os.unlink(tmp_fpath)
+                self.skipped += 1
+            else:
+                os.replace(tmp_fpath, fpath)
+                self.written += 1
+        finally:
+            if os.path.exists(tmp_fpath):
+                os.unlink(tmp_fpath)
+
+    def _unchanged(self, fpath, data):
+        try:
+            if os.stat(fpath).st_size != len(data):
+                return False
+            with open(fpath, 'rb') as f:
+                return f.read() == data
+        except FileNotFoundError:
+            return False
+
+    def report(self):
+        return f'{self.written} files written, {self.skipped} unchanged'
@@ -0,0 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
+
+
+def chunksize(n_items, workers, chunks_per_worker=4):
+    """Split work into a few chunks per worker to keep IPC overhead low."""
+    return max(1, n_items // (workers * chunks_per_worker))
+
+
+def pool_map(func, items, workers=1):
+    """Lazily map `func` over `items`, preserving their order.
+
+    With more than one worker the calls are fanned out over a process pool,
+    so `func` and `items` must be picklable. Exceptions are raised in the
+    same order as they would be by the builtin `map`.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) < 2:
+        yield from map(func, items)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            func, items, chunksize=chunksize(len(items), workers))
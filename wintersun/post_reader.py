@@ -1,36 +1,88 @@
+import os
 import re
 from pathlib import Path
 
 import markdown2
 
+from wintersun import build_cache, parallel
+
 
 class MdFileReader:
     MD_GLOB = '**/*.md'
+    MD_EXTRAS = ['metadata']
     TEMPLATED_FILENAME_FILTER = re.compile(r'[^a-z^A-Z^0-9-]')
 
     @classmethod
-    def read(cls, root):
-        return cls._read_from_root(root)
+    def read(cls, root, cache=None, workers=1):
+        """
+        :param root: Directory searched for markdown files.
+        :param cache: Optional BuildCache; unchanged files aren't re-parsed.
+        :param workers: Number of processes parsing markdown files.
+        """
+        return cls._read_from_root(root, cache, workers)
+
+    @classmethod
+    def read_file(cls, md_file_path, cache=None):
+        """Read a single markdown file, see `read`."""
+        md_file_path = Path(md_file_path)
+        post = cache.get(md_file_path) if cache is not None else None
+        if post is None:
+            post, source = cls._read_file(md_file_path)
+            if cache is not None:
+                cache.put(md_file_path, source, post)
+        return post
 
     @classmethod
-    def _read_from_root(cls, root):
+    def standardized_name(cls, md_file_path):
+        """Name of the HTML file generated from `md_file_path`."""
+        return cls._standardize_filename(Path(md_file_path))
+
+    @classmethod
+    def cache_key(cls):
+        """Identifies markdown settings that affect the parsed output."""
+        return {'markdown2': markdown2.__version__, 'extras': cls.MD_EXTRAS}
+
+    @classmethod
+    def _read_from_root(cls, root, cache=None, workers=1):
         md_files = cls._find(root)
-        md_posts = []
-        for md_file_path in md_files:
-            html = markdown2.markdown_path(md_file_path, extras=['metadata'])
-            md_posts.append({
-                'title': html.metadata['Title'],
-                'date': html.metadata['Date'],
-                'template': html.metadata['Template'],
-                'tags': html.metadata['Tags'].split(' '),
-                'standardized_name': cls._standardize_filename(md_file_path),
-                'contents': str(html)})
+        md_posts = [
+            cache.get(md_file_path) if cache is not None else None
+            for md_file_path in md_files]
+
+        pending = [idx for idx, post in enumerate(md_posts) if post is None]
+        parsed = parallel.pool_map(
+            cls._read_file, [md_files[idx] for idx in pending], workers)
+        for idx, (post, source) in zip(pending, parsed):
+            if cache is not None:
+                cache.put(md_files[idx], source, post)
+            md_posts[idx] = post
+
+        if cache is not None:
+            cache.prune(root, md_files)
         return md_posts
 
+    @classmethod
+    def _read_file(cls, md_file_path):
+        # same as markdown2.markdown_path, but the raw bytes are kept around
+        # so they can be fingerprinted for the build cache
+        stat = os.stat(md_file_path)
+        with open(md_file_path, 'rb') as f:
+            data = f.read()
+        source = build_cache.fingerprint(stat, data)
+        html = markdown2.markdown(data.decode('utf-8'), extras=cls.MD_EXTRAS)
+        post = {
+            'title': html.metadata['Title'],
+            'date': html.metadata['Date'],
+            'template': html.metadata['Template'],
+            'tags': html.metadata['Tags'].split(' '),
+            'standardized_name': cls._standardize_filename(md_file_path),
+            'contents': str(html)}
+        return post, source
+
     @classmethod
     def _find(cls, root):
         root = Path(root)
-        return list(root.glob(cls.MD_GLOB))
+        return sorted(root.glob(cls.MD_GLOB))
 
     @classmethod
     def _standardize_filename(cls, filename):
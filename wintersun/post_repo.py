@@ -6,28 +6,28 @@ from wintersun import exceptions, post_item
 class InMemPostRepo:
     def __init__(self):
         self.posts = []
+        self._by_title = {}
+        self._dates = {}
+        # sorted views, rebuilt lazily after an insert
+        self._ordered = {}
+        self._by_template = {}
 
     def get(self, title):
-        for post in self.posts:
-            if post.title == title:
-                return post
-        raise exceptions.NotFound(f'Post "{title}" not found')
+        try:
+            return self._by_title[title]
+        except KeyError:
+            raise exceptions.NotFound(f'Post "{title}" not found')
 
     def all(self, order='desc'):
-        if order not in ('asc', 'desc'):
-            raise exceptions.PostRepoException(
-                f'Invalid sorting order: "{order}"')
-        reverse = order == 'desc'
-        ordered_posts = sorted(
-            self.posts,
-            key=lambda post: self._to_dt(post.date),
-            reverse=reverse)
-        return ordered_posts
+        return list(self._ordered_view(order))
 
     def all_by_template(self, template_name, order='desc'):
-        posts = self.all(order)
-        filtered = [p for p in posts if p.template == template_name]
-        return filtered
+        key = (template_name, order)
+        if key not in self._by_template:
+            self._by_template[key] = [
+                p for p in self._ordered_view(order)
+                if p.template == template_name]
+        return list(self._by_template[key])
 
     def insert(self,
                title,
@@ -37,15 +37,40 @@ class InMemPostRepo:
                date,
                tags=None):
         tags = tags if tags else []
-        try:
-            existing = self.get(title)
+        existing = self._by_title.get(title)
+        if existing is not None:
             raise exceptions.DuplicatePost(
                 f'Post titled "{title}" from "{existing.date}" already exists, '
                 f'cannot insert post dated "{date}"')
-        except exceptions.NotFound:
-            self.posts.append(
-                post_item.PostItem(title, contents, standardized_name,
-                                   template, date, tags))
+
+        dt = self._to_dt(date)
+        post = post_item.PostItem(title, contents, standardized_name,
+                                  template, date, tags)
+        self.posts.append(post)
+        self._by_title[title] = post
+        self._dates[title] = dt
+        self._ordered.clear()
+        self._by_template.clear()
+
+    def remove(self, title):
+        post = self.get(title)
+        self.posts.remove(post)
+        del self._by_title[title]
+        del self._dates[title]
+        self._ordered.clear()
+        self._by_template.clear()
+        return post
+
+    def _ordered_view(self, order):
+        if order not in ('asc', 'desc'):
+            raise exceptions.PostRepoException(
+                f'Invalid sorting order: "{order}"')
+        if order not in self._ordered:
+            self._ordered[order] = sorted(
+                self.posts,
+                key=lambda post: self._dates[post.title],
+                reverse=order == 'desc')
+        return self._ordered[order]
 
     def _to_dt(self, dt_str):
         return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
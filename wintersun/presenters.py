@@ -5,16 +5,49 @@ from pathlib import Path
 
 import pytz
 
-from wintersun import atom_generator, exceptions
+from wintersun import atom_generator, exceptions, output, parallel, renderers
+
+
+def _write_pages(renderer, writer, pages, workers=1, tracker=None):
+    """Render pages and write them to disk.
+
+    :param writer: FileWriter used to write the rendered pages.
+    :param pages: Iterable of (file_path, template_name, context) tuples.
+    :param workers: With more than one worker, pages are rendered in
+                    batches by a process pool and written as each batch
+                    comes back.
+    :param tracker: Optional RenderTracker; pages whose templates and
+                    context didn't change since the last build are skipped.
+    """
+    if tracker is not None:
+        pages = tracker.stale_pages(renderer, pages)
+
+    if workers <= 1:
+        for fpath, template_name, context in pages:
+            writer.write(fpath, renderer.render(template_name, **context))
+        return
+
+    pages = list(pages)
+    size = parallel.chunksize(len(pages), workers)
+    batches = [pages[idx:idx + size] for idx in range(0, len(pages), size)]
+    jobs = [(renderer, [(tpl, ctx) for _, tpl, ctx in batch])
+            for batch in batches]
+    rendered = parallel.pool_map(renderers.render_batch, jobs, workers)
+    for batch, texts in zip(batches, rendered):
+        for (fpath, _, _), text in zip(batch, texts):
+            writer.write(fpath, text)
 
 
 class AtomPresenter:
-    def __init__(self, feed_title, site_url, post_dir, author, encoding):
+    def __init__(self, feed_title, site_url, post_dir, author, encoding,
+                 writer=None, full_content=False):
         self.feed_title = feed_title
         self.site_url = site_url
         self.post_dir = post_dir
         self.author = author
         self.encoding = encoding
+        self.writer = writer or output.FileWriter()
+        self.full_content = full_content
 
     def output(self, posts, target='./feed'):
         """
@@ -24,12 +57,10 @@ class AtomPresenter:
         target_path = Path(target)
         feed = atom_generator.Feed(self.feed_title, self.site_url,
                                    self._rfc3339_ts_now())
-        with open(target_path, 'w', encoding=self.encoding) as f:
-            for post in posts:
-                if post.template in ('Post', 'Essay'):
-                    feed.add_entry(
-                        self._generate_atom_entry_dict(post))
-            f.write(feed.generate_xml())
+        entries = (self._generate_atom_entry_dict(post) for post in posts
+                   if post.template in ('Post', 'Essay'))
+        with self.writer.open(target_path, self.encoding) as f:
+            feed.write(f, entries)
 
     def _rfc3339_suffix(self, date):
         return date + 'T00:00:00-05:00'
@@ -50,16 +81,20 @@ class AtomPresenter:
             'published': self._rfc3339_suffix(post.date),
             'updated': self._rfc3339_suffix(post.date),
             'name': self.author,
-            'content': post.contents[:100] + '...'}
+            'content': (post.contents if self.full_content
+                        else post.contents[:100] + '...')}
         return entry
 
 
 class HTMLIndexPresenter:
     """Generate index HTML files for posts."""
-    def __init__(self, html_renderer, site_url, post_dir):
+    def __init__(self, html_renderer, site_url, post_dir, writer=None,
+                 tracker=None):
         self.renderer = html_renderer
         self.site_url = site_url
         self.post_dir = post_dir
+        self.writer = writer or output.FileWriter()
+        self.tracker = tracker
 
     def output(self, posts, template_name, target_dir, grouped=True):
         # 'grouped' is confusing, because the template should imply it
@@ -73,8 +108,8 @@ class HTMLIndexPresenter:
                 for k, group in self._group_by_year(index_entries)
             }
 
-        with open(target_fpath, 'w') as f:
-            f.write(self.renderer.render(index_tpl_name, entries=index_entries))
+        pages = [(target_fpath, index_tpl_name, {'entries': index_entries})]
+        _write_pages(self.renderer, self.writer, pages, tracker=self.tracker)
 
     def _generate_index_entries(self, posts):
         entries = [{
@@ -99,26 +134,34 @@ class HTMLIndexPresenter:
 
 class HTMLPresenter:
     """Convert existing contents into HTML files."""
-    def __init__(self, html_renderer):
+    def __init__(self, html_renderer, workers=1, writer=None, tracker=None):
         self.renderer = html_renderer
+        self.workers = workers
+        self.writer = writer or output.FileWriter()
+        self.tracker = tracker
 
     def output(self, posts, target_dir):
         self._write_posts(posts, target_dir)
 
     def _write_posts(self, posts, target_dir):
         target_dir.mkdir(mode=0o755, exist_ok=True)
-        for post in posts:
-            template_name = post.template.lower() + '.html'
-            post_fpath = target_dir / (post.standardized_name + '.html')
-            with open(post_fpath, 'w') as f:
-                f.write(self.renderer.render(template_name, post=post))
+        pages = ((target_dir / (post.standardized_name + '.html'),
+                  post.template.lower() + '.html',
+                  {'post': post})
+                 for post in posts)
+        _write_pages(self.renderer, self.writer, pages, self.workers,
+                     self.tracker)
 
 
 class TagPresenter:
-    def __init__(self, html_renderer, site_url, post_dir):
+    def __init__(self, html_renderer, site_url, post_dir, workers=1,
+                 writer=None, tracker=None):
         self.renderer = html_renderer
         self.site_url = site_url
         self.post_dir = post_dir
+        self.workers = workers
+        self.writer = writer or output.FileWriter()
+        self.tracker = tracker
 
     def _extract_by_tag(self, posts):
         tagged_posts = defaultdict(list)
@@ -139,12 +182,12 @@ class TagPresenter:
             [self.site_url, self.post_dir, post.standardized_name + '.html'])
 
     def output(self, posts, target_dir):
-        target_dir.mkdir(mode=0o755)
+        target_dir.mkdir(mode=0o755, exist_ok=True)
         tagged_posts = self._extract_by_tag(posts)
 
-        for tag, post_list in tagged_posts.items():
-            index_fpath = target_dir / (tag + '.html')
-            with open(index_fpath, 'w') as f:
-                f.write(
-                    self.renderer.render(
-                        'tag.html', tag=tag, tagged_items=post_list))
+        pages = ((target_dir / (tag + '.html'),
+                  'tag.html',
+                  {'tag': tag, 'tagged_items': post_list})
+                 for tag, post_list in tagged_posts.items())
+        _write_pages(self.renderer, self.writer, pages, self.workers,
+                     self.tracker)
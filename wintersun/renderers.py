@@ -1,11 +1,128 @@
-from jinja2 import Environment, FileSystemLoader
+import hashlib
+import os
+
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    ModuleLoader, meta)
+
+# renderers unpickled in worker processes, one per set of constructor args
+_shared_renderers = {}
+
+
+def _shared_renderer(*args):
+    if args not in _shared_renderers:
+        _shared_renderers[args] = TemplateRenderer(*args)
+    return _shared_renderers[args]
+
+
+def render_batch(batch):
+    """Render a batch of pages, meant to be run in a worker process.
+
+    :param batch: Tuple of a TemplateRenderer and a list of
+                  (template_name, context) tuples.
+    :returns: List of rendered pages, in the order given.
+    """
+    renderer, pages = batch
+    return [renderer.render(template_name, **context)
+            for template_name, context in pages]
+
+
+def _newest_mtime(template_dir):
+    mtimes = [os.stat(os.path.join(dirpath, name)).st_mtime
+              for dirpath, _, filenames in os.walk(template_dir)
+              for name in filenames]
+    return max(mtimes, default=0)
+
+
+def precompile(template_dir, target):
+    """Compile all templates into a module archive at `target`.
+
+    The archive is only rebuilt when a template is newer than it.
+
+    :returns: True if the archive was (re)built.
+    """
+    target = str(target)
+    if (os.path.exists(target) and
+            os.stat(target).st_mtime >= _newest_mtime(template_dir)):
+        return False
+
+    env = Environment(loader=FileSystemLoader(template_dir))
+    tmp_target = target + '.tmp'
+    env.compile_templates(tmp_target, zip='deflated', ignore_errors=False)
+    os.replace(tmp_target, target)
+    return True
 
 
 class TemplateRenderer:
-    def __init__(self, template_dir):
+    def __init__(self, template_dir, bytecode_dir=None, precompiled=None):
+        """
+        :param template_dir: Directory with Jinja2 templates.
+        :param bytecode_dir: Optional directory for the on-disk bytecode
+                             cache. Cached templates are invalidated by
+                             Jinja2 when their source changes.
+        :param precompiled: Optional module archive made by `precompile`,
+                            loaded instead of parsing `template_dir`.
+        """
+        self.template_dir = template_dir
+        self.bytecode_dir = bytecode_dir
+        self.precompiled = precompiled
+
+        bytecode_cache = None
+        if bytecode_dir is not None:
+            os.makedirs(bytecode_dir, mode=0o755, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+
+        if precompiled is not None:
+            loader = ModuleLoader(str(precompiled))
+        else:
+            loader = FileSystemLoader(template_dir)
         self.template_env = Environment(
-            loader=FileSystemLoader(template_dir))
+            loader=loader, bytecode_cache=bytecode_cache)
+        # sources are always read from template_dir, precompiled or not
+        self._source_loader = FileSystemLoader(template_dir)
+        self._digests = {}
 
     def render(self, template_name, **kwargs):
         template = self.template_env.get_template(template_name)
         return template.render(**kwargs)
+
+    def _source(self, template_name):
+        source, _, _ = self._source_loader.get_source(
+            self.template_env, template_name)
+        return source
+
+    def dependencies(self, template_name):
+        """Templates `template_name` renders with, including itself.
+
+        Follows extends/include/import chains found in the template ASTs.
+        A reference that isn't a string literal could be any template, so
+        it makes every template a dependency.
+        """
+        found = set()
+        pending = [template_name]
+        while pending:
+            name = pending.pop()
+            if name in found:
+                continue
+            found.add(name)
+            ast = self.template_env.parse(self._source(name))
+            for referenced in meta.find_referenced_templates(ast):
+                if referenced is None:
+                    return sorted(self._source_loader.list_templates())
+                pending.append(referenced)
+        return sorted(found)
+
+    def template_digest(self, template_name):
+        """Hash of every template `template_name` depends on."""
+        if template_name not in self._digests:
+            digest = hashlib.sha256()
+            for name in self.dependencies(template_name):
+                digest.update(name.encode('utf-8') + b'\0')
+                digest.update(self._source(name).encode('utf-8') + b'\0')
+            self._digests[template_name] = digest.hexdigest()
+        return self._digests[template_name]
+
+    def __reduce__(self):
+        # Only the settings are pickled. Every worker process builds a single
+        # environment from them, so templates are compiled once per worker.
+        return (_shared_renderer,
+                (self.template_dir, self.bytecode_dir, self.precompiled))
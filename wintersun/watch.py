@@ -0,0 +1,176 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+import traceback
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _walk_files(directory):
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+class PollingWatcher:
+    """Detects changed files by comparing mtimes and sizes periodically."""
+    def __init__(self, directories, interval=0.5):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for directory in self.directories:
+            for path in _walk_files(directory):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self):
+        """Block until files change.
+
+        :returns: Set of created, modified or deleted file paths.
+        """
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher, called through ctypes; directories are watched
+    recursively, including ones created later."""
+    def __init__(self, directories, settle=0.05):
+        self.settle = settle
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = {}
+        for directory in directories:
+            self._watch_tree(os.path.abspath(directory))
+
+    @classmethod
+    def available(cls):
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            return False
+        return hasattr(ctypes.CDLL(libc_name), 'inotify_init1')
+
+    def _watch_tree(self, directory):
+        """Watch `directory` and its subdirectories.
+
+        :returns: Files already in the tree, which may have been created
+                  before the watches were in place.
+        """
+        found = set()
+        for dirpath, _, filenames in os.walk(directory):
+            wd = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = dirpath
+            found.update(os.path.join(dirpath, name) for name in filenames)
+        return found
+
+    def _read_events(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._watch_tree(path))
+                continue
+            changed.add(path)
+        return changed
+
+    def wait(self):
+        """Block until files change.
+
+        :returns: Set of created, modified or deleted file paths.
+        """
+        while True:
+            select.select([self.fd], [], [])
+            changed = self._read_events()
+            # editors tend to write files in several steps, collect them all
+            while select.select([self.fd], [], [], self.settle)[0]:
+                changed.update(self._read_events())
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def get_watcher(directories):
+    if InotifyWatcher.available():
+        return InotifyWatcher(directories)
+    return PollingWatcher(directories)
+
+
+def watch(site):
+    """Rebuild `site` whenever one of its source directories changes.
+
+    Errors are printed and watching continues, so a half-written post
+    doesn't end the session.
+    """
+    watcher = get_watcher(site.watched_dirs())
+    print(f'Watching for changes with {watcher.__class__.__name__}')
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            try:
+                site.rebuild(changed)
+            except Exception:
+                traceback.print_exc()
+                continue
+            elapsed = time.perf_counter() - start
+            print(f'Rebuilt {len(changed)} changed files in {elapsed:.3f}s')
+            print(site.report())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()